@@ -1,119 +1,622 @@
 import os
+import atexit
 import csv
 import socket
+import shutil
 import logging
+import logging.handlers
+import mmap
+import collections
+import contextlib
+import random
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import MISSING, dataclass, field, fields
 from dotenv import load_dotenv
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
 import paramiko
 
 MAX_RETRIES = 3
+RETRY_BACKOFF_BASE = 1
+RETRY_BACKOFF_CAP = 10
+RETRY_DEADLINE = 30
+DEFAULT_CONCURRENCY = 8
+SSH_POOL_IDLE_TIMEOUT = 300
+SSH_KEEPALIVE_INTERVAL = 30
+CONNECT_TIMEOUT = 10
+BANNER_TIMEOUT = 10
+AUTH_TIMEOUT = 15
+COPY_BUFFER_SIZE = 1024 * 1024
+FILE_LIST_BUFFER_SIZE = 1024 * 1024
+FILE_LIST_ENCODING = 'utf-8'
+SFTP_WINDOW_SIZE = 64 * 1024 * 1024
+SFTP_MAX_PACKET_SIZE = 256 * 1024
+
+# Algorithms tried first during negotiation, fastest first; unsupported ones are ignored
+PREFERRED_CIPHERS = ('aes128-gcm@openssh.com', 'aes256-gcm@openssh.com', 'aes128-ctr', 'aes256-ctr')
+PREFERRED_DIGESTS = ('hmac-sha2-256-etm@openssh.com', 'hmac-sha2-256')
+PREFERRED_KEX = ('curve25519-sha256', 'curve25519-sha256@libssh.org', 'ecdh-sha2-nistp256')
+
+# Open SSH connections keyed by (host, port, username, public key, disabled algorithms),
+# as [client, last use time, number of callers currently using it]
+_SSH_POOL = {}
+_SSH_POOL_LOCK = threading.Lock()
 
 # Load environment variables from .env file
 load_dotenv()
 
-def validate_private_key(private_key_path: str) -> bool:
+def validate_private_key(private_key_path: str) -> Optional[paramiko.PKey]:
     """
-    Validates the private key file.
+    Validates and loads the private key file.
+
+    Ed25519, ECDSA and RSA keys are tried in that order, fastest first.
 
     Parameters:
     - private_key_path (str): Path to the private key file.
 
     Returns:
-    - bool: True if the private key is valid, False otherwise.
+    - Optional[paramiko.PKey]: The loaded private key if it is valid, None otherwise.
     """
-    try:
-        with open(private_key_path, 'r') as key_file:
-            paramiko.RSAKey(filename=private_key_path)
-            return True
-    except (FileNotFoundError, paramiko.ssh_exception.SSHException):
-        return False
+    for key_class in (paramiko.Ed25519Key, paramiko.ECDSAKey, paramiko.RSAKey):
+        try:
+            return key_class(filename=private_key_path)
+        except FileNotFoundError:
+            return None
+        except paramiko.ssh_exception.SSHException:
+            continue
+    return None
+
+def setup_logging(log_level: int = logging.INFO) -> None:
+    """
+    Configures logging to the console with the specified log level.
+
+    Records are put on a queue and written by a background listener thread, so
+    transfer threads never block on console output.
+
+    Parameters:
+    - log_level (int): Logging level (default is logging.INFO).
+    """
+    log_queue = queue.SimpleQueue()
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, console_handler)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+
+def _read_quoted_file_list(file_list_path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Reads the file list with the csv module, for files that contain quoted fields.
+
+    Parameters:
+    - file_list_path (str): Path to the CSV file with Source and Destination columns.
+
+    Returns:
+    - Iterator[Tuple[str, str]]: (source, destination) pairs, one per row.
+    """
+    with open(file_list_path, 'r', buffering=FILE_LIST_BUFFER_SIZE, encoding=FILE_LIST_ENCODING,
+              newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        source_index, destination_index = header.index('Source'), header.index('Destination')
+        min_length = max(source_index, destination_index) + 1
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < min_length:
+                logging.error("Skipping malformed row %s in %s: %s", reader.line_num, file_list_path, row)
+                continue
+            yield row[source_index], row[destination_index]
+
+def read_file_list(file_list_path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Reads the source and destination paths from the CSV file list.
+
+    The file is memory-mapped and split on raw newlines and commas, decoding only
+    the two fields that are needed. Files containing quoted fields fall back to
+    the csv module.
+
+    Parameters:
+    - file_list_path (str): Path to the CSV file with Source and Destination columns.
+
+    Returns:
+    - Iterator[Tuple[str, str]]: (source, destination) pairs, one per row.
+    """
+    with open(file_list_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b'"') != -1:
+                yield from _read_quoted_file_list(file_list_path)
+                return
+
+            size = len(mm)
+            position = 0
+            line_number = 0
+            header = None
+            while position < size:
+                end = mm.find(b'\n', position)
+                if end == -1:
+                    end = size
+                line = mm[position:end].rstrip(b'\r')
+                position = end + 1
+                line_number += 1
+                if not line:
+                    continue
+
+                columns = line.split(b',')
+                if header is None:
+                    header = [column.decode(FILE_LIST_ENCODING) for column in columns]
+                    source_index, destination_index = header.index('Source'), header.index('Destination')
+                    min_length = max(source_index, destination_index) + 1
+                    continue
+                if len(columns) < min_length:
+                    logging.error("Skipping malformed row %s in %s: %s", line_number, file_list_path,
+                                  line.decode(FILE_LIST_ENCODING, 'replace'))
+                    continue
+                yield (columns[source_index].decode(FILE_LIST_ENCODING),
+                       columns[destination_index].decode(FILE_LIST_ENCODING))
+
+def _prefer(available: Tuple[str, ...], preferred: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Moves the preferred algorithms that are available to the front of the list.
+
+    Parameters:
+    - available (Tuple[str, ...]): Algorithms supported by the transport.
+    - preferred (Tuple[str, ...]): Algorithms to try first, in order of preference.
+
+    Returns:
+    - Tuple[str, ...]: The available algorithms, reordered.
+    """
+    first = [name for name in preferred if name in available]
+    return tuple(first + [name for name in available if name not in first])
+
+def _create_transport(*args, **kwargs) -> paramiko.Transport:
+    """
+    Creates an SSH transport that favours fast ciphers, MACs and key exchanges.
+
+    Returns:
+    - paramiko.Transport: The new transport, not yet started.
+    """
+    transport = paramiko.Transport(*args, **kwargs)
+    options = transport.get_security_options()
+    options.ciphers = _prefer(options.ciphers, PREFERRED_CIPHERS)
+    options.digests = _prefer(options.digests, PREFERRED_DIGESTS)
+    options.kex = _prefer(options.kex, PREFERRED_KEX)
+    return transport
 
-def is_host_reachable(host: str, port: int = 22) -> bool:
+def _get_or_connect(host: str, port: int, username: str, pkey: paramiko.PKey,
+                    disabled_algorithms: Optional[str] = None) -> paramiko.SSHClient:
     """
-    Checks if the specified host is reachable.
+    Returns a pooled SSH connection to the specified host, connecting if needed.
+
+    Connections are pooled per host, port, username, key and disabled algorithms.
+    Each call must be paired with _release_connection once the caller is done.
+    Connections that are not in use and have been idle for longer than
+    SSH_POOL_IDLE_TIMEOUT, or whose transport is no longer active, are closed and
+    replaced. New connections are made without holding the pool lock, so a slow
+    host does not block callers for other hosts.
 
     Parameters:
     - host (str): Hostname or IP address.
-    - port (int): Port number (default is 22).
+    - port (int): Port number.
+    - username (str): Username for authentication.
+    - pkey (paramiko.PKey): Private key for authentication.
+    - disabled_algorithms (Optional[str]): Comma-separated public key algorithms to disable.
+
+    Returns:
+    - paramiko.SSHClient: A connected SSH client.
+    """
+    key = (host, port, username, pkey.asbytes(), disabled_algorithms)
+    stale = []
+    with _SSH_POOL_LOCK:
+        now = time.monotonic()
+        for pool_key, entry in list(_SSH_POOL.items()):
+            pooled, last_used, users = entry
+            transport = pooled.get_transport()
+            if transport is None or not transport.is_active():
+                # Dead connections are dropped even while in use; the last user closes them on release
+                del _SSH_POOL[pool_key]
+                if not users:
+                    stale.append((pool_key, pooled))
+            elif not users and now - last_used > SSH_POOL_IDLE_TIMEOUT:
+                del _SSH_POOL[pool_key]
+                stale.append((pool_key, pooled))
+
+        entry = _SSH_POOL.get(key)
+        if entry is not None:
+            entry[1] = now
+            entry[2] += 1
+
+    for pool_key, stale_ssh in stale:
+        logging.debug("Closing pooled SSH connection to %s:%s", pool_key[0], pool_key[1])
+        stale_ssh.close()
+
+    if entry is not None:
+        logging.debug("Reusing pooled SSH connection to %s:%s", host, port)
+        return entry[0]
+
+    ssh = paramiko.SSHClient()
+    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    if disabled_algorithms :
+        logging.info("disabled_algorithms=%s", disabled_algorithms)
+    try:
+        ssh.connect(host, port=port, username=username, pkey=pkey,
+                    disabled_algorithms=dict(pubkeys=disabled_algorithms) if disabled_algorithms else None,
+                    timeout=CONNECT_TIMEOUT, banner_timeout=BANNER_TIMEOUT, auth_timeout=AUTH_TIMEOUT,
+                    transport_factory=_create_transport)
+    except Exception:
+        ssh.close()
+        raise
+    transport = ssh.get_transport()
+    transport.set_keepalive(SSH_KEEPALIVE_INTERVAL)
+    logging.debug("Negotiated cipher %s with %s:%s", transport.remote_cipher, host, port)
+
+    with _SSH_POOL_LOCK:
+        entry = _SSH_POOL.get(key)
+        if entry is None:
+            _SSH_POOL[key] = [ssh, time.monotonic(), 1]
+            return ssh
+        entry[1] = time.monotonic()
+        entry[2] += 1
+
+    # Another thread connected to the same host in the meantime
+    ssh.close()
+    return entry[0]
+
+def _release_connection(ssh: paramiko.SSHClient) -> None:
+    """
+    Returns a connection obtained from _get_or_connect to the pool.
+
+    The idle timeout restarts from now. Connections that were dropped from the
+    pool while in use are closed.
+
+    Parameters:
+    - ssh (paramiko.SSHClient): The connection to release.
+    """
+    with _SSH_POOL_LOCK:
+        for entry in _SSH_POOL.values():
+            if entry[0] is ssh:
+                entry[1] = time.monotonic()
+                entry[2] -= 1
+                return
+    ssh.close()
+
+def close_pool() -> None:
+    """
+    Closes every pooled SSH connection.
+    """
+    with _SSH_POOL_LOCK:
+        for ssh, _, _ in _SSH_POOL.values():
+            ssh.close()
+        _SSH_POOL.clear()
+
+def is_up_to_date(remote_stat: paramiko.SFTPAttributes, destination: str) -> bool:
+    """
+    Checks if the local file already matches the remote file's size and modification time.
+
+    Parameters:
+    - remote_stat (paramiko.SFTPAttributes): Attributes of the file on the SFTP server.
+    - destination (str): Local path of the file.
 
     Returns:
-    - bool: True if the host is reachable, False otherwise.
+    - bool: True if the local file is up to date, False otherwise.
     """
     try:
-        socket.create_connection((host, port), timeout=10)
-        return True
-    except (ConnectionRefusedError, socket.gaierror):
+        local_stat = os.stat(destination)
+    except FileNotFoundError:
         return False
+    return (remote_stat.st_size == local_stat.st_size
+            and int(remote_stat.st_mtime) == int(local_stat.st_mtime))
 
-def setup_logging(log_level: int = logging.INFO) -> None:
+def _safe_stat(sftp: paramiko.SFTPClient, source: str) -> Tuple[bool, Optional[paramiko.SFTPAttributes]]:
     """
-    Configures logging to the console with the specified log level.
+    Retrieves the attributes of a remote file, logging any error.
+
+    Only missing or unreadable files are reported as inaccessible. Other errors may
+    be transient, so the file is kept and left to the retries of transfer_file.
 
     Parameters:
-    - log_level (int): Logging level (default is logging.INFO).
+    - sftp (paramiko.SFTPClient): SFTP channel to query.
+    - source (str): Path of the file on the SFTP server.
+
+    Returns:
+    - Tuple[bool, Optional[paramiko.SFTPAttributes]]: Whether the file may be accessible,
+      and its attributes if they could be retrieved.
     """
-    logging.basicConfig(level=log_level, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        return True, sftp.stat(source)
+    except (FileNotFoundError, PermissionError) as e:
+        logging.error("Skipping file %s: %s", source, e)
+        return False, None
+    except Exception as e:
+        logging.warning("Error accessing file %s, retrying during transfer: %s", source, e)
+        return True, None
 
-def sftp_transfer(host: str, username: str, private_key_path: str, file_list_path: str, port: int = 22) -> None:
+def _drop_page_cache(file) -> None:
+    """
+    Flushes a written file to disk and asks the kernel to evict it from the page cache.
+
+    This is only a hint: it does nothing on platforms without posix_fadvise, and
+    errors from files that do not support it (e.g. /dev/null, FIFOs, some network
+    filesystems) are logged at DEBUG and ignored.
+
+    Parameters:
+    - file: Open file object that was written to.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    file.flush()
+    try:
+        os.fdatasync(file.fileno())
+        os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError as e:
+        logging.debug("Could not drop %s from the page cache: %s", file.name, e)
+
+def transfer_file(sftp: paramiko.SFTPClient, source: str, destination: str,
+                  remote_stat: Optional[paramiko.SFTPAttributes] = None) -> bool:
+    """
+    Downloads a single file over an open SFTP channel, retrying on failure.
+
+    Transient errors are retried with exponential backoff and jitter, while missing
+    or unreadable files are not retried. Files whose local copy already matches the
+    remote size and modification time are skipped. The whole file is prefetched so
+    that read requests are pipelined instead of waiting for each reply in turn, and
+    the written file is evicted from the page cache so it does not push out other
+    data. The local modification time is set to the remote one.
+
+    Parameters:
+    - sftp (paramiko.SFTPClient): SFTP channel to download the file with.
+    - source (str): Path of the file on the SFTP server.
+    - destination (str): Local path where the file should be saved.
+    - remote_stat (Optional[paramiko.SFTPAttributes]): Attributes of the remote file, if already known.
+
+    Returns:
+    - bool: True if the local file is up to date after the call, False otherwise.
+    """
+    deadline = time.monotonic() + RETRY_DEADLINE
+    for retry_count in range(MAX_RETRIES):
+        try:
+            if remote_stat is None:
+                remote_stat = sftp.stat(source)
+            if is_up_to_date(remote_stat, destination):
+                logging.info("Skipping %s, %s is up to date", source, destination)
+                return True
+            with sftp.open(source, 'rb') as remote_file:
+                remote_file.prefetch(remote_stat.st_size)
+                with open(destination, 'wb') as local_file:
+                    shutil.copyfileobj(remote_file, local_file, COPY_BUFFER_SIZE)
+                    _drop_page_cache(local_file)
+            os.utime(destination, (remote_stat.st_mtime, remote_stat.st_mtime))
+            logging.info("Successfully transferred %s to %s", source, destination)
+            return True
+        except (FileNotFoundError, PermissionError) as e:
+            logging.error("Error transferring file %s: %s", source, e)
+            return False
+        except (IOError, paramiko.SSHException) as e:
+            logging.error("Error transferring file %s: %s", source, e)
+        except Exception as e:
+            logging.error("Unexpected error transferring file %s: %s", source, e)
+
+        delay = min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** retry_count) * random.uniform(0.5, 1.5)
+        if retry_count + 1 == MAX_RETRIES or time.monotonic() + delay > deadline:
+            break
+        time.sleep(delay)
+    return False
+
+def link_or_copy(source_path: str, destination: str) -> None:
+    """
+    Hard links a local file to another path, copying it when linking is not possible.
+
+    The link or copy is made under a temporary name and then moved into place, so
+    an existing destination is kept if it fails. Destinations that already match
+    the file's size and modification time are left alone.
+
+    Parameters:
+    - source_path (str): Path of the existing local file.
+    - destination (str): Path to link or copy the file to.
+    """
+    try:
+        if is_up_to_date(os.stat(source_path), destination):
+            logging.info("Skipping %s, %s is up to date", source_path, destination)
+            return
+
+        fd, temporary = tempfile.mkstemp(prefix=f".{os.path.basename(destination)}.",
+                                         dir=os.path.dirname(destination) or '.')
+        os.close(fd)
+        try:
+            try:
+                os.remove(temporary)
+                os.link(source_path, temporary)
+            except OSError:
+                shutil.copy2(source_path, temporary)
+            os.replace(temporary, destination)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(temporary)
+            raise
+        logging.info("Successfully copied %s to %s", source_path, destination)
+    except OSError as e:
+        logging.error("Error copying file %s to %s: %s", source_path, destination, e)
+
+def _open_channels(ssh: paramiko.SSHClient, count: int) -> List[paramiko.SFTPClient]:
+    """
+    Opens up to count SFTP channels over the SSH connection.
+
+    Servers limit the number of sessions per connection (MaxSessions), so opening
+    stops at the first channel the server refuses. At least one channel is always
+    attempted, even if count is lower.
+
+    Parameters:
+    - ssh (paramiko.SSHClient): Connected SSH client.
+    - count (int): Maximum number of channels to open.
+
+    Returns:
+    - List[paramiko.SFTPClient]: The open channels, at least one.
+
+    Raises:
+    - paramiko.SSHException: If not even one channel can be opened.
+    """
+    channels = []
+    for _ in range(max(count, 1)):
+        try:
+            channels.append(paramiko.SFTPClient.from_transport(ssh.get_transport(), window_size=SFTP_WINDOW_SIZE,
+                                                               max_packet_size=SFTP_MAX_PACKET_SIZE))
+        except paramiko.SSHException as e:
+            if not channels:
+                raise
+            logging.warning("Server refused more than %s SFTP channels: %s", len(channels), e)
+            break
+    return channels
+
+def _dispatch(executor: ThreadPoolExecutor, function: Callable, items: Iterable, contexts: List) -> None:
+    """
+    Calls a function on every item using long-lived workers that pull from a shared iterator.
+
+    One worker is started per context, and the function is called with the worker's
+    context and the item. This avoids creating a future per item, which dominates the
+    overhead on very large file lists. If waiting is interrupted (e.g. by Ctrl-C),
+    workers finish their current item and stop pulling new ones.
+
+    Parameters:
+    - executor (ThreadPoolExecutor): Executor to run the workers on.
+    - function (Callable): Function to call with a context and each item.
+    - items (Iterable): Items to process.
+    - contexts (List): One context per worker, such as an SFTP channel.
+    """
+    iterator = iter(items)
+    iterator_lock = threading.Lock()
+    stop = threading.Event()
+
+    def _drain(context) -> None:
+        while not stop.is_set():
+            with iterator_lock:
+                item = next(iterator, None)
+            if item is None:
+                return
+            function(context, item)
+
+    futures = [executor.submit(_drain, context) for context in contexts]
+    try:
+        for future in futures:
+            future.result()
+    except BaseException:
+        stop.set()
+        raise
+
+def _transfer_file_list(ssh: paramiko.SSHClient, file_list_path: str, concurrency: int) -> None:
+    """
+    Transfers the files of the file list over SFTP channels of an SSH connection.
+
+    Parameters:
+    - ssh (paramiko.SSHClient): Connected SSH client.
+    - file_list_path (str): Path to the file containing the list of files to transfer.
+    - concurrency (int): Maximum number of files transferred in parallel.
+    """
+    try:
+        channels = _open_channels(ssh, concurrency)
+    except paramiko.SSHException as e:
+        logging.error("Error opening SFTP channel: %s", e)
+        return
+
+    stats = []
+
+    def _stat_worker(sftp: paramiko.SFTPClient, group: Tuple[str, dict]) -> None:
+        source, destinations = group
+        accessible, remote_stat = _safe_stat(sftp, source)
+        if accessible:
+            stats.append((source, list(destinations), remote_stat))
+
+    def _transfer_worker(sftp: paramiko.SFTPClient, item: tuple) -> None:
+        source, destinations, remote_stat = item
+        # Fall back to the next destination if downloading to one fails, e.g. a missing local directory
+        for index, destination in enumerate(destinations):
+            if transfer_file(sftp, source, destination, remote_stat):
+                for extra_destination in destinations[index + 1:]:
+                    link_or_copy(destination, extra_destination)
+                return
+
+    try:
+        # Destinations of each source, in file list order (dicts used as ordered sets)
+        groups = collections.defaultdict(dict)
+        destination_sources = {}
+        for source, destination in read_file_list(file_list_path):
+            previous_source = destination_sources.get(destination)
+            if previous_source is not None and previous_source != source:
+                # Two sources written to the same path in parallel would corrupt it; the last one listed wins
+                logging.warning("%s is listed for both %s and %s, only %s will be transferred to it",
+                                destination, previous_source, source, source)
+                del groups[previous_source][destination]
+                if not groups[previous_source]:
+                    del groups[previous_source]
+            destination_sources[destination] = source
+            groups[source][destination] = None
+
+        with ThreadPoolExecutor(max_workers=len(channels)) as executor:
+            _dispatch(executor, _stat_worker, groups.items(), channels)
+            _dispatch(executor, _transfer_worker, stats, channels)
+        logging.info("SFTP transfer completed successfully.")
+    finally:
+        for sftp in channels:
+            sftp.close()
+
+def sftp_transfer(host: str, username: str, private_key_path: str, file_list_path: str, port: int = 22,
+                  concurrency: int = DEFAULT_CONCURRENCY, disabled_algorithms: Optional[str] = None) -> None:
     """
     Performs SFTP file transfer to the specified host.
 
+    Files are downloaded in parallel by a pool of worker threads, each using its own
+    SFTP channel multiplexed over the single SSH connection. If the server refuses
+    some of the channels, fewer workers are used. Channels are opened with a large
+    flow-control window so that high-latency links are not throttled. Every
+    source is stat'ed up front so that missing files are dropped before any transfer
+    starts. A source listed several times is downloaded once and linked or copied
+    to its other destinations. A destination listed for several sources only
+    receives the last one.
+
     Parameters:
     - host (str): Hostname or IP address.
     - port (int): Port number (default is 22).
     - username (str): Username for authentication.
     - private_key_path (str): Path to the private key file for authentication.
     - file_list_path (str): Path to the file containing the list of files to transfer.
+    - concurrency (int): Number of files transferred in parallel (default is 8).
+    - disabled_algorithms (Optional[str]): Comma-separated public key algorithms to disable.
     """
-    if not validate_private_key(private_key_path):
+    pkey = validate_private_key(private_key_path)
+    if pkey is None:
         logging.error("Invalid private key.")
         return
 
-    if not is_host_reachable(host, port):
+    try:
+        ssh = _get_or_connect(host, port, username, pkey, disabled_algorithms)
+    except (socket.gaierror, socket.timeout, ConnectionRefusedError,
+            paramiko.ssh_exception.NoValidConnectionsError):
         logging.error("Host is not reachable.")
         return
-
-    ssh = paramiko.SSHClient()
-    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    
-    try:
-        if disabled_algorithms :
-            logging.info(f"disabled_algorithms=" + disabled_algorithms)
-            ssh.connect(host, port=port, username=username, pkey=paramiko.RSAKey(filename=private_key_path),
-                        disabled_algorithms=dict(pubkeys=disabled_algorithms))
-        else :
-            ssh.connect(host, port=port, username=username, pkey=paramiko.RSAKey(filename=private_key_path))
     except paramiko.AuthenticationException:
         logging.error("Authentication error.")
         return
     except paramiko.SSHException as e:
-        logging.error(f"Error connecting via SSH: {e}")
+        logging.error("Error connecting via SSH: %s", e)
         return
 
     try:
-        with ssh.open_sftp() as sftp:
-            with open(file_list_path, 'r') as file:
-                csv_reader = csv.DictReader(file)
-                for row in csv_reader:
-                    source, destination = row['Source'], row['Destination']
-
-                    for retry_count in range(MAX_RETRIES):
-                        try:
-                            sftp.get(source, destination)
-                            logging.info(f"Successfully transferred {source} to {destination}")
-                            break
-                        except (FileNotFoundError, PermissionError, IOError) as e:
-                            logging.error(f"Error transferring file {source}: {e}")
-                        except Exception as e:
-                            logging.error(f"Unexpected error transferring file {source}: {e}")
-        logging.info("SFTP transfer completed successfully.")
+        _transfer_file_list(ssh, file_list_path, concurrency)
     finally:
-        ssh.close()
+        _release_connection(ssh)
 
 def check_env_variables(required_vars: List[str]) -> None:
     """
-    Checks if all required environment variables are set.
+    Checks if all required environment variables are set to a non-empty value.
 
     Parameters:
     - required_vars (List[str]): List of required environment variable names.
@@ -121,31 +624,81 @@ def check_env_variables(required_vars: List[str]) -> None:
     Raises:
     - ValueError: If any required variable is missing.
     """
-    missing_variables = [var for var in required_vars if not os.getenv(var)]
+    set_variables = {name for name, value in os.environ.items() if value}
+    missing_variables = sorted(set(required_vars) - set_variables)
     if missing_variables:
         error_message = f"Missing required environment variables: {', '.join(missing_variables)}"
         logging.error(error_message)
         raise ValueError(error_message)
 
-if __name__ == "__main__":
-    required_env_variables = ["SFTP_HOST", "SFTP_USERNAME", "SFTP_PRIVATE_KEY_PATH", "SFTP_FILE_LIST_PATH"]
+def _parse_log_level(value: str) -> int:
+    """
+    Converts a log level name such as "debug" or "INFO" to its logging constant.
+
+    Parameters:
+    - value (str): Name of the log level.
+
+    Returns:
+    - int: The logging level.
+    """
+    return getattr(logging, value.upper())
+
+@dataclass(frozen=True)
+class Config:
+    """
+    Settings of the utility, read from environment variables.
+
+    Each field's metadata names its environment variable and, for non-string
+    fields, the function that parses it. Fields without a default are required.
+    """
+    host: str = field(metadata={"env": "SFTP_HOST"})
+    username: str = field(metadata={"env": "SFTP_USERNAME"})
+    private_key_path: str = field(metadata={"env": "SFTP_PRIVATE_KEY_PATH"})
+    file_list_path: str = field(metadata={"env": "SFTP_FILE_LIST_PATH"})
+    port: int = field(default=22, metadata={"env": "SFTP_PORT", "parse": int})
+    concurrency: int = field(default=DEFAULT_CONCURRENCY, metadata={"env": "SFTP_CONCURRENCY", "parse": int})
+    log_level: int = field(default=logging.INFO, metadata={"env": "LOG_LEVEL", "parse": _parse_log_level})
+    disabled_algorithms: Optional[str] = field(default=None, metadata={"env": "DISABLE_ALGORITHM"})
 
-    check_env_variables(required_env_variables)
+    def __post_init__(self) -> None:
+        if self.concurrency < 1:
+            error_message = f"SFTP_CONCURRENCY must be at least 1, got {self.concurrency}"
+            logging.error(error_message)
+            raise ValueError(error_message)
 
-    host = os.getenv("SFTP_HOST")
-    port = int(os.getenv("SFTP_PORT", 22))
-    username = os.getenv("SFTP_USERNAME")
-    private_key_path = os.getenv("SFTP_PRIVATE_KEY_PATH")
-    file_list_path = os.getenv("SFTP_FILE_LIST_PATH")
-    log_level = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper())
-    disabled_algorithms = os.getenv("DISABLE_ALGORITHM")
+    @classmethod
+    def from_env(cls) -> "Config":
+        """
+        Builds the configuration from environment variables.
 
+        Returns:
+        - Config: The configuration.
 
-    setup_logging(log_level)
+        Raises:
+        - ValueError: If any required variable is missing or a value is invalid.
+        """
+        config_fields = fields(cls)
+        check_env_variables([f.metadata["env"] for f in config_fields if f.default is MISSING])
+
+        values = {}
+        for config_field in config_fields:
+            value = os.getenv(config_field.metadata["env"])
+            if value:
+                parse = config_field.metadata.get("parse")
+                values[config_field.name] = parse(value) if parse else value
+        return cls(**values)
+
+if __name__ == "__main__":
+    config = Config.from_env()
+
+    setup_logging(config.log_level)
 
     try:
-        sftp_transfer(host, username, private_key_path, file_list_path, port)
+        sftp_transfer(config.host, config.username, config.private_key_path, config.file_list_path, config.port,
+                      config.concurrency, config.disabled_algorithms)
     except KeyboardInterrupt:
         logging.info("Script interrupted by user.")
     except Exception as e:
-        logging.error(f"Global SFTP error: {e}")
\ No newline at end of file
+        logging.error("Global SFTP error: %s", e)
+    finally:
+        close_pool()
\ No newline at end of file